@@ -2,11 +2,20 @@ import { defineConfig } from '@playwright/test';
 
 export default defineConfig({
   testDir: './tests/e2e',
-  testMatch: ['critical-path.spec.ts', 'setup-auth.spec.ts', 'redesign-screenshots.spec.ts'],
+  testMatch: [
+    'critical-path.spec.ts',
+    'setup-auth.spec.ts',
+    // The screenshot harness re-walks every tab the critical path already covers;
+    // it only runs when explicitly requested.
+    ...(process.env.RELAY_SCREENSHOTS ? ['redesign-screenshots.spec.ts'] : []),
+  ],
   timeout: 60 * 1000,
   expect: {
     timeout: 15 * 1000,
   },
-  workers: 1,
+  // Each spec launches Electron with its own --user-data-dir and PocketBase port,
+  // so spec files can run side by side. Tests inside a file stay serial. Windows
+  // pins userData to %APPDATA%/Relay (see src/main/index.ts), so it stays at one worker.
+  workers: process.platform === 'win32' ? 1 : undefined,
   reporter: [['list']],
 });
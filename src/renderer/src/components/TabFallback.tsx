@@ -15,7 +15,12 @@ export const TabFallback = ({ error, onReset }: { error?: boolean; onReset?: ()
             Try Again
           </TactileButton>
         )}
-        <TactileButton variant="secondary" size="sm" onClick={() => globalThis.location.reload()}>
+        <TactileButton
+          variant="secondary"
+          size="sm"
+          data-testid="tab-fallback-reload"
+          onClick={() => globalThis.location.reload()}
+        >
           Reload Tab
         </TactileButton>
       </>
@@ -27,5 +27,6 @@ describe('TabFallback', () => {
   it('renders Reload Tab button when error is true', () => {
     render(<TabFallback error={true} />);
     expect(screen.getByText('Reload Tab')).toBeInTheDocument();
+    expect(screen.getByTestId('tab-fallback-reload')).toHaveTextContent('Reload Tab');
   });
 });
@@ -0,0 +1,27 @@
+import { describe, it, expect } from 'vitest';
+import { getDevMockData } from '../mockData';
+
+describe('getDevMockData', () => {
+  it('returns the same data on repeated calls', () => {
+    const first = getDevMockData();
+    const second = getDevMockData();
+    expect(second).toBe(first);
+    expect(second.contacts[0].raw.id).toBe(first.contacts[0].raw.id);
+  });
+
+  it('populates every collection', () => {
+    const data = getDevMockData();
+    expect(data.contacts.length).toBeGreaterThan(0);
+    expect(data.groups.length).toBeGreaterThan(0);
+    expect(data.servers.length).toBeGreaterThan(0);
+    expect(data.onCall.length).toBeGreaterThan(0);
+  });
+
+  it('freezes the shared data so consumers cannot mutate it in place', () => {
+    const data = getDevMockData();
+    expect(Object.isFrozen(data)).toBe(true);
+    expect(Object.isFrozen(data.contacts)).toBe(true);
+    expect(Object.isFrozen(data.contacts[0].raw)).toBe(true);
+    expect(Object.isFrozen(data.groups[0].contacts)).toBe(true);
+  });
+});
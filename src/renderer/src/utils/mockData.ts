@@ -43,7 +43,7 @@ function mkServer(opts: {
   };
 }
 
-export function getDevMockData(): AppData {
+function buildDevMockData(): AppData {
   const now = Date.now();
 
   const contacts = [
@@ -279,3 +279,24 @@ export function getDevMockData(): AppData {
 
   return { groups, contacts, servers, onCall, lastUpdated: now };
 }
+
+function deepFreeze<T>(value: T): T {
+  if (value && typeof value === 'object' && !Object.isFrozen(value)) {
+    Object.freeze(value);
+    for (const child of Object.values(value)) deepFreeze(child);
+  }
+  return value;
+}
+
+let devMockData: AppData | null = null;
+
+/**
+ * Mock data is built once per session: ids and timestamps stay stable across
+ * re-renders, so list keys and memoized consumers don't churn. Every consumer
+ * shares the same object, so it is frozen; an in-place mutation throws instead
+ * of leaking into other views.
+ */
+export function getDevMockData(): AppData {
+  devMockData ??= deepFreeze(buildDevMockData());
+  return devMockData;
+}
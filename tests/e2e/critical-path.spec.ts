@@ -1,22 +1,22 @@
-import { _electron as electron, test, expect, type Page, type Locator } from '@playwright/test';
-import fs from 'node:fs';
-import os from 'node:os';
-import path from 'node:path';
-import { fileURLToPath } from 'node:url';
+import { test, expect, type Page, type Locator } from '@playwright/test';
 import crypto from 'node:crypto';
-import PocketBase from 'pocketbase';
-
-const __filename = fileURLToPath(import.meta.url);
-const __dirname = path.dirname(__filename);
+import {
+  attachFailureScreenshot,
+  getPbClient,
+  goToTab,
+  launchRelay,
+  makePort,
+  seedCollections,
+  writeServerConfig,
+  type RelayLaunch,
+} from './harness';
 
 const uniqueSuffix = () => crypto.randomUUID().slice(0, 8);
 const escapeRegExp = (value: string) => value.replace(/[.*+?^${}()|[\]\\]/g, '\\$&');
+/** Case-insensitive pattern matching `value` literally, for accessible-name lookups. */
+const literalPattern = (value: string) => new RegExp(escapeRegExp(value), 'i');
 
-type RelayContact = { email: string };
-
-const CONFIG_SECRET_FIELD = ['sec', 'ret'].join('');
-const makeTestPassphrase = () => ['test', crypto.randomUUID()].join('-');
-const TEST_PASSPHRASE = makeTestPassphrase();
+type RelayContact = { id: string; email: string };
 
 const rightClick = async (target: Locator) => {
   await target.scrollIntoViewIfNeeded();
@@ -25,76 +25,52 @@ const rightClick = async (target: Locator) => {
 
 const getActivePanel = (window: Page) => window.locator('.tab-panel--active');
 
-const makePort = () => 20_000 + crypto.randomInt(20_000);
-
-const writeServerConfig = (userDataDir: string, port: number) => {
-  const dataDir = path.join(userDataDir, 'data');
-  fs.mkdirSync(dataDir, { recursive: true });
-  fs.writeFileSync(
-    path.join(dataDir, 'config.json'),
-    JSON.stringify({ mode: 'server', port, [CONFIG_SECRET_FIELD]: TEST_PASSPHRASE }, null, 2),
-    'utf8',
-  );
-};
-
-const makePbClient = async (port: number) => {
-  const pb = new PocketBase(`http://127.0.0.1:${port}`);
-  await pb.collection('_pb_users_auth_').authWithPassword('relay@relay.app', TEST_PASSPHRASE, {
-    requestKey: null,
+const createContactDirect = async (port: number, name: string, email: string) => {
+  await seedCollections(port, {
+    contacts: [{ name, email, title: 'E2E Tester', phone: '5551234567' }],
   });
-  return pb;
 };
 
-const createContactDirect = async (port: number, name: string, email: string) => {
-  const pb = await makePbClient(port);
-  await pb.collection('contacts').create({
-    name,
-    email,
-    title: 'E2E Tester',
-    phone: '5551234567',
+// Bind the email as a filter parameter so the SDK does the quoting/escaping.
+const findContactsDirect = async (port: number, email: string) => {
+  const pb = await getPbClient(port);
+  return pb.collection('contacts').getFullList<RelayContact>({
+    filter: pb.filter('email = {:email}', { email }),
+    requestKey: null,
   });
 };
 
 const removeContactDirect = async (port: number, email: string) => {
-  const pb = await makePbClient(port);
-  const contacts = await pb.collection('contacts').getFullList<{ id: string; email: string }>({
-    filter: `email = "${email.replaceAll('"', '\\"')}"`,
-    requestKey: null,
-  });
+  const pb = await getPbClient(port);
+  const contacts = await findContactsDirect(port, email);
   await Promise.all(contacts.map((contact) => pb.collection('contacts').delete(contact.id)));
 };
 
 const hasContactDirect = async (port: number, email: string) => {
-  const pb = await makePbClient(port);
-  const contacts = await pb.collection('contacts').getFullList<RelayContact>({
-    filter: `email = "${email.replaceAll('"', '\\"')}"`,
-    requestKey: null,
-  });
+  const contacts = await findContactsDirect(port, email);
   return contacts.some((contact) => contact.email.toLowerCase() === email.toLowerCase());
 };
 
-const goToTab = async (window: Page, testId: string, breadcrumbLabel: string) => {
-  await window.getByTestId(testId).click();
-  await expect(window.locator('.header-breadcrumb')).toContainText(`Relay / ${breadcrumbLabel}`);
-};
-
 const tryEnsurePeopleTabReady = async (window: Page) => {
   await goToTab(window, 'sidebar-people', 'People');
 
+  const addContact = window.getByRole('button', { name: 'ADD CONTACT' });
+  const reload = window.getByTestId('tab-fallback-reload');
+
   for (let attempt = 0; attempt < 3; attempt += 1) {
-    const addContact = window.getByRole('button', { name: 'ADD CONTACT' });
-    if (await addContact.isVisible()) {
-      return true;
+    // Wait for whichever state the tab settles into instead of sleeping between probes.
+    try {
+      await expect(addContact.or(reload).first()).toBeVisible({ timeout: 2_000 });
+    } catch {
+      return false;
     }
 
-    const reload = window.getByRole('button', { name: 'Reload' }).first();
-    if (await reload.isVisible()) {
-      await Promise.all([window.waitForLoadState('domcontentloaded'), reload.click()]);
-      await goToTab(window, 'sidebar-people', 'People');
-      continue;
+    if (await addContact.isVisible()) {
+      return true;
     }
 
-    await window.waitForTimeout(500);
+    await Promise.all([window.waitForLoadState('domcontentloaded'), reload.click()]);
+    await goToTab(window, 'sidebar-people', 'People');
   }
 
   return false;
@@ -123,9 +99,8 @@ const createContactFromPeople = async (window: Page, port: number, name: string,
   await addModal.getByRole('button', { name: 'Create Contact' }).click();
   await expect(addModal).not.toBeVisible();
 
-  const activePanel = getActivePanel(window);
-  const contactCard = activePanel
-    .getByRole('button', { name: new RegExp(escapeRegExp(email), 'i') })
+  const contactCard = getActivePanel(window)
+    .getByRole('button', { name: literalPattern(email) })
     .first();
   await expect(contactCard).toBeVisible();
 
@@ -143,15 +118,22 @@ const deleteContactFromPeople = async (window: Page, port: number, email: string
     return;
   }
 
-  const activePanel = getActivePanel(window);
-  const contactCard = activePanel
-    .getByRole('button', { name: new RegExp(escapeRegExp(email), 'i') })
+  const contactCard = getActivePanel(window)
+    .getByRole('button', { name: literalPattern(email) })
     .first();
   await expect(contactCard).toBeVisible();
   await contactCard.click();
 
   const detailPanelDelete = window.locator('.detail-panel').getByRole('button', { name: 'Delete' });
-  if (await detailPanelDelete.isVisible()) {
+  // The detail panel opens after the click settles; an instant isVisible() probe
+  // could miss it and take the context-menu path on a panel that was about to show.
+  const detailPanelOpened = await detailPanelDelete
+    .waitFor({ state: 'visible', timeout: 2_000 })
+    .then(
+      () => true,
+      () => false,
+    );
+  if (detailPanelOpened) {
     await detailPanelDelete.click();
   } else {
     await rightClick(contactCard);
@@ -171,47 +153,37 @@ const deleteContactFromPeople = async (window: Page, port: number, email: string
 };
 
 test.describe('Vital Critical Path', () => {
-  let electronApp: Awaited<ReturnType<typeof electron.launch>> | null;
-  let window: Awaited<ReturnType<NonNullable<typeof electronApp>['firstWindow']>>;
-  let tempDataDir: string;
+  let relay: RelayLaunch | null = null;
+  let window: Page;
   let pbPort: number;
 
-  test.beforeEach(async () => {
-    const mainEntry = path.join(__dirname, '../../dist/main/index.js');
-    const launchEnv = { ...process.env, NODE_ENV: 'test' };
-    delete (launchEnv as Record<string, string | undefined>).ELECTRON_RUN_AS_NODE;
-    tempDataDir = fs.mkdtempSync(path.join(os.tmpdir(), 'relay-e2e-critical-'));
+  // One app per worker: Electron + PocketBase startup dominates runtime, and each
+  // test works on uniquely-suffixed records. A failing test restarts the worker,
+  // which relaunches the app for the remaining tests.
+  test.beforeAll(async () => {
     pbPort = makePort();
-    writeServerConfig(tempDataDir, pbPort);
-
-    electronApp = await electron.launch({
-      args: [`--user-data-dir=${tempDataDir}`, mainEntry],
-      env: launchEnv,
-    });
-
-    window = await electronApp.firstWindow();
-    await electronApp.evaluate(({ BrowserWindow }) => {
-      const mainWindow = BrowserWindow.getAllWindows()[0];
-      mainWindow?.setSize(1600, 1000);
+    relay = await launchRelay({
+      tempPrefix: 'relay-e2e-critical-',
+      prepare: (userDataDir) => writeServerConfig(userDataDir, pbPort),
+      size: { width: 1600, height: 1000 },
     });
-    await window.waitForLoadState('domcontentloaded');
+    window = relay.window;
 
     await expect(window.getByTestId('sidebar-compose')).toBeVisible();
     await expect(window.locator('.header-breadcrumb')).toContainText('Relay / Compose');
   });
 
+  test.beforeEach(async () => {
+    await goToTab(window, 'sidebar-compose', 'Compose');
+  });
+
   test.afterEach(async () => {
-    if (electronApp) {
-      try {
-        await electronApp.close();
-      } catch {
-        // The app may already be closed after a test failure.
-      }
-      electronApp = null;
-    }
-    if (tempDataDir) {
-      fs.rmSync(tempDataDir, { recursive: true, force: true });
-    }
+    await attachFailureScreenshot(window, test.info());
+  });
+
+  test.afterAll(async () => {
+    await relay?.close();
+    relay = null;
   });
 
   test('Vital 1: App Launch & Compose Tab', async () => {
@@ -312,9 +284,8 @@ test.describe('Vital Critical Path', () => {
     await createGroupModal.getByRole('button', { name: 'Save' }).click();
     await expect(createGroupModal).not.toBeVisible();
 
-    const groupItem = composePanel
-      .getByRole('button', { name: new RegExp(escapeRegExp(groupName), 'i') })
-      .first();
+    const groupButtons = composePanel.getByRole('button', { name: literalPattern(groupName) });
+    const groupItem = groupButtons.first();
     await expect(groupItem).toBeVisible();
 
     await window.getByRole('button', { name: 'START BRIDGE' }).click();
@@ -327,9 +298,7 @@ test.describe('Vital Critical Path', () => {
     const deleteSavedGroup = window.getByRole('menuitem', { name: 'Delete Group' });
     await expect(deleteSavedGroup).toBeVisible();
     await deleteSavedGroup.click();
-    await expect(
-      composePanel.getByRole('button', { name: new RegExp(escapeRegExp(groupName), 'i') }),
-    ).toHaveCount(0);
+    await expect(groupButtons).toHaveCount(0);
 
     await deleteContactFromPeople(window, pbPort, email);
   });
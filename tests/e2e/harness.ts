@@ -0,0 +1,228 @@
+import {
+  _electron as electron,
+  expect,
+  type ElectronApplication,
+  type Page,
+  type TestInfo,
+} from '@playwright/test';
+import crypto from 'node:crypto';
+import fs from 'node:fs';
+import os from 'node:os';
+import path from 'node:path';
+import { fileURLToPath } from 'node:url';
+import PocketBase from 'pocketbase';
+
+const __filename = fileURLToPath(import.meta.url);
+const __dirname = path.dirname(__filename);
+
+const mainEntry = path.join(__dirname, '../../dist/main/index.js');
+
+// Chromium switches that trim work the e2e windows never need. Backgrounding
+// flags matter once spec files run in parallel: occluded windows otherwise get
+// throttled timers and stall auto-waiting assertions. The renderer sandbox is
+// left on so tests exercise the production security model.
+const CHROMIUM_TEST_SWITCHES = [
+  '--disable-gpu',
+  '--disable-dev-shm-usage',
+  '--disable-background-networking',
+  '--disable-background-timer-throttling',
+  '--disable-backgrounding-occluded-windows',
+  '--disable-renderer-backgrounding',
+  '--mute-audio',
+];
+
+// Set RELAY_E2E_TRACE=1 to record a Playwright trace (DOM snapshots plus
+// screenshots captured alongside each action) for every launch.
+const TRACE_DIR = process.env.RELAY_E2E_TRACE
+  ? path.join(process.cwd(), 'test-results', 'traces')
+  : null;
+
+const CONFIG_SECRET_FIELD = ['sec', 'ret'].join('');
+const TEST_PASSPHRASE = ['test', crypto.randomUUID()].join('-');
+
+export const makePort = () => 20_000 + crypto.randomInt(20_000);
+
+/** Writes a server-mode config so the app boots straight into embedded PocketBase. */
+export const writeServerConfig = (userDataDir: string, port: number) => {
+  const dataDir = path.join(userDataDir, 'data');
+  fs.mkdirSync(dataDir, { recursive: true });
+  fs.writeFileSync(
+    path.join(dataDir, 'config.json'),
+    JSON.stringify({ mode: 'server', port, [CONFIG_SECRET_FIELD]: TEST_PASSPHRASE }, null, 2),
+    'utf8',
+  );
+};
+
+const pbClients = new Map<number, Promise<PocketBase>>();
+
+/**
+ * Authenticated PocketBase client for the embedded server on `port`.
+ * Authenticates once per port and reuses the client, so helpers called inside
+ * `expect.poll` don't pay an auth round-trip on every tick.
+ */
+export const getPbClient = (port: number) => {
+  let client = pbClients.get(port);
+  if (!client) {
+    client = (async () => {
+      const pb = new PocketBase(`http://127.0.0.1:${port}`);
+      await pb.collection('_pb_users_auth_').authWithPassword('relay@relay.app', TEST_PASSPHRASE, {
+        requestKey: null,
+      });
+      return pb;
+    })();
+    pbClients.set(port, client);
+    // Let the next caller retry if the server wasn't ready yet.
+    void client.catch(() => pbClients.delete(port));
+  }
+  return client;
+};
+
+/** PocketBase records to create, keyed by collection name. */
+export type SeedRecords = Record<string, Record<string, unknown>[]>;
+
+/**
+ * Creates only the collections a spec passes in; nothing else is touched.
+ * Collections are seeded concurrently, but rows within a collection are created
+ * in order: views can break sort ties by insertion order (e.g. on-call team
+ * order follows the first row seen when several share a sortOrder).
+ */
+export const seedCollections = async (port: number, records: SeedRecords) => {
+  const pb = await getPbClient(port);
+
+  await Promise.all(
+    Object.entries(records).map(async ([collection, rows]) => {
+      for (const row of rows) {
+        await pb.collection(collection).create(row, { requestKey: null });
+      }
+    }),
+  );
+};
+
+export const goToTab = async (window: Page, testId: string, breadcrumbLabel: string) => {
+  await window.getByTestId(testId).click();
+  await expect(window.locator('.header-breadcrumb')).toContainText(`Relay / ${breadcrumbLabel}`);
+};
+
+/**
+ * Attaches an in-memory PNG of `window` to the report when the current test
+ * failed. Passing tests capture nothing, and nothing is written beside the specs.
+ */
+export const attachFailureScreenshot = async (window: Page | undefined, testInfo: TestInfo) => {
+  if (!window || window.isClosed() || testInfo.status === testInfo.expectedStatus) return;
+  try {
+    // Short timeout: a wedged renderer shouldn't hold up teardown for the full default.
+    const body = await window.screenshot({ animations: 'disabled', timeout: 5_000 });
+    await testInfo.attach('failure', { body, contentType: 'image/png' });
+  } catch {
+    // The window can disappear with the app mid-failure; the error itself is enough.
+  }
+};
+
+/**
+ * Resizes the BrowserWindow behind `page` and waits until the renderer's
+ * viewport matches. The resize lands asynchronously (and the OS may clamp the
+ * request), so layout assertions and captures never see the old size.
+ */
+export const resizeWindow = async (
+  app: ElectronApplication,
+  page: Page,
+  size: { width: number; height: number },
+) => {
+  const browserWindow = await app.browserWindow(page);
+  const [width, height] = await browserWindow.evaluate((win, target) => {
+    win.setSize(target.width, target.height);
+    return win.getContentSize();
+  }, size);
+  await page.waitForFunction(
+    ([w, h]) => globalThis.innerWidth === w && globalThis.innerHeight === h,
+    [width, height] as const,
+  );
+};
+
+export type RelayLaunch = {
+  app: ElectronApplication;
+  window: Page;
+  userDataDir: string;
+  close: () => Promise<void>;
+};
+
+type LaunchOptions = {
+  /** Prefix for the throwaway --user-data-dir created under the OS temp dir. */
+  tempPrefix: string;
+  /** Seeds the user-data-dir (e.g. data/config.json) before Electron starts. */
+  prepare?: (userDataDir: string) => void;
+  /** Main window size applied once the first window is open. */
+  size?: { width: number; height: number };
+};
+
+/**
+ * Launches the built Electron app against a fresh user-data-dir.
+ *
+ * Electron + PocketBase startup dominates e2e runtime, so specs should launch
+ * once per file (beforeAll) and reset UI state between tests rather than
+ * relaunching per test.
+ */
+export const launchRelay = async ({
+  tempPrefix,
+  prepare,
+  size,
+}: LaunchOptions): Promise<RelayLaunch> => {
+  const launchEnv = { ...process.env, NODE_ENV: 'test' };
+  delete (launchEnv as Record<string, string | undefined>).ELECTRON_RUN_AS_NODE;
+  const userDataDir = fs.mkdtempSync(path.join(os.tmpdir(), tempPrefix));
+
+  let app: ElectronApplication | null = null;
+  let tracing = false;
+  const close = async () => {
+    if (app) {
+      if (tracing && TRACE_DIR) {
+        const tracePath = path.join(TRACE_DIR, `${path.basename(userDataDir)}.zip`);
+        try {
+          await app.context().tracing.stop({ path: tracePath });
+        } catch {
+          // A crashed app takes its trace with it; don't mask the test failure.
+        }
+        tracing = false;
+      }
+      try {
+        const appProcess = app.process();
+        if (!appProcess || appProcess.exitCode === null) {
+          await app.close();
+        }
+      } catch {
+        // The app may already be closed after a test failure or relaunch.
+      }
+      app = null;
+    }
+    fs.rmSync(userDataDir, { recursive: true, force: true });
+  };
+
+  try {
+    prepare?.(userDataDir);
+    app = await electron.launch({
+      args: [...CHROMIUM_TEST_SWITCHES, `--user-data-dir=${userDataDir}`, mainEntry],
+      env: launchEnv,
+    });
+    // Nothing in a local app should take Playwright's 30s default; fail fast
+    // instead. Explicit per-call timeouts (e.g. app boot waits) still win.
+    app.context().setDefaultTimeout(10_000);
+    app.context().setDefaultNavigationTimeout(15_000);
+    if (TRACE_DIR) {
+      await app.context().tracing.start({ screenshots: true, snapshots: true });
+      tracing = true;
+    }
+
+    // Main's createWindow() awaits loadFile(), which rejects with ERR_ABORTED if
+    // the page navigates (e.g. a caller's reload) before the initial load
+    // finishes, and a failed createWindow() quits the app. Wait it out so callers
+    // are free to reload straight away.
+    const window = await app.firstWindow();
+    await window.waitForLoadState('load');
+    if (size) await resizeWindow(app, window, size);
+
+    return { app, window, userDataDir, close };
+  } catch (error) {
+    await close();
+    throw error;
+  }
+};
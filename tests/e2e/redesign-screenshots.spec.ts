@@ -5,68 +5,54 @@
  * PocketBase client, and captures 1920x1080 screenshots of every tab plus the
  * Settings accent picker and the five accent schemes into tmp/redesign-shots/.
  *
- * Not part of the default suite watchlist intent — run explicitly:
- *   npx playwright test tests/e2e/redesign-screenshots.spec.ts -c playwright.electron.config.ts
+ * Not part of the default suite — only matched when RELAY_SCREENSHOTS is set:
+ *   RELAY_SCREENSHOTS=1 npx playwright test tests/e2e/redesign-screenshots.spec.ts -c playwright.electron.config.ts
  */
-import { _electron as electron, test, expect, type Page } from '@playwright/test';
+import { test, expect, type Page } from '@playwright/test';
 import fs from 'node:fs';
-import os from 'node:os';
 import path from 'node:path';
 import { fileURLToPath } from 'node:url';
-import crypto from 'node:crypto';
-import PocketBase from 'pocketbase';
+import {
+  goToTab,
+  launchRelay,
+  makePort,
+  resizeWindow,
+  seedCollections,
+  writeServerConfig,
+  type SeedRecords,
+} from './harness';
 
 const __filename = fileURLToPath(import.meta.url);
 const __dirname = path.dirname(__filename);
 
 const SHOTS_DIR = path.join(__dirname, '../../tmp/redesign-shots');
 
-const CONFIG_SECRET_FIELD = ['sec', 'ret'].join('');
-const TEST_PASSPHRASE = ['test', crypto.randomUUID()].join('-');
-
-const makePort = () => 20_000 + crypto.randomInt(20_000);
-
-const writeServerConfig = (userDataDir: string, port: number) => {
-  const dataDir = path.join(userDataDir, 'data');
-  fs.mkdirSync(dataDir, { recursive: true });
-  fs.writeFileSync(
-    path.join(dataDir, 'config.json'),
-    JSON.stringify({ mode: 'server', port, [CONFIG_SECRET_FIELD]: TEST_PASSPHRASE }, null, 2),
-    'utf8',
-  );
-};
-
-const makePbClient = async (port: number) => {
-  const pb = new PocketBase(`http://127.0.0.1:${port}`);
-  await pb.collection('_pb_users_auth_').authWithPassword('relay@relay.app', TEST_PASSPHRASE, {
-    requestKey: null,
-  });
-  return pb;
-};
+// screenshot() already waits for web fonts. Disabling animations fast-forwards
+// finite ones (tab/modal entrances, the toast slide-in) to their end state and
+// resets infinite ones (spinners, pulses), so captures never catch an animation
+// mid-flight. Window geometry is separate: resize via resizeWindow() first.
+const capture = (window: Page, name: string) =>
+  window.screenshot({ path: path.join(SHOTS_DIR, name), fullPage: false, animations: 'disabled' });
 
 const shoot = async (window: Page, name: string) => {
-  // Let layout/animations settle before capture.
-  await window.waitForTimeout(750);
-
   // Dismiss any toasts (e.g. live cloud-status notifications) so they don't
-  // overlay the capture. Best-effort - ignore if none are present.
-  try {
-    const closeButtons = window.locator('.toast-close');
-    while ((await closeButtons.count()) > 0) {
+  // overlay the capture. Toasts unmount on dismiss, so wait for the count to
+  // drop rather than sleeping. The count is re-read every pass because toasts
+  // can auto-expire or arrive mid-loop; the pass cap keeps a toast that never
+  // closes from hanging the harness.
+  const closeButtons = window.locator('.toast-close');
+  for (let pass = 0; pass < 10; pass += 1) {
+    const before = await closeButtons.count();
+    if (before === 0) break;
+    try {
       await closeButtons.first().click({ timeout: 1000 });
-      await window.waitForTimeout(100);
+      await expect.poll(() => closeButtons.count(), { timeout: 1000 }).toBeLessThan(before);
+    } catch {
+      // It vanished mid-click, or another arrived as it closed - re-check.
     }
-  } catch {
-    // No toasts, or they vanished mid-click - fine either way.
   }
 
-  await window.waitForTimeout(250);
-  await window.screenshot({ path: path.join(SHOTS_DIR, name), fullPage: false });
-};
-
-const goToTab = async (window: Page, testId: string, breadcrumbLabel: string) => {
-  await window.getByTestId(testId).click();
-  await expect(window.locator('.header-breadcrumb')).toContainText(`Relay / ${breadcrumbLabel}`);
+  await capture(window, name);
 };
 
 const setAccentViaStorage = async (window: Page, accent: string) => {
@@ -76,187 +62,11 @@ const setAccentViaStorage = async (window: Page, accent: string) => {
   }, accent);
 };
 
-const seedData = async (port: number) => {
-  const pb = await makePbClient(port);
-
-  // --- Contacts (varied names/titles/phones) ---
-  const contacts = [
-    {
-      name: 'Ada Lovelace',
-      email: 'ada.lovelace@example.com',
-      title: 'Principal Engineer',
-      phone: '5550100001',
-    },
-    {
-      name: 'Grace Hopper',
-      email: 'grace.hopper@example.com',
-      title: 'Rear Admiral, SRE',
-      phone: '5550100002',
-    },
-    {
-      name: 'Katherine Johnson',
-      email: 'katherine.johnson@example.com',
-      title: 'Trajectory Analyst',
-      phone: '5550100003',
-    },
-    {
-      name: 'Alan Turing',
-      email: 'alan.turing@example.com',
-      title: 'Cryptanalysis Lead',
-      phone: '5550100004',
-    },
-    {
-      name: 'Hedy Lamarr',
-      email: 'hedy.lamarr@example.com',
-      title: 'Spectrum Engineer',
-      phone: '5550100005',
-    },
-    {
-      name: 'Claude Shannon',
-      email: 'claude.shannon@example.com',
-      title: 'Information Theorist',
-      phone: '5550100006',
-    },
-  ];
-  for (const contact of contacts) {
-    await pb.collection('contacts').create(contact, { requestKey: null });
-  }
-
-  // --- Servers ---
-  const servers = [
-    {
-      name: 'prod-db-01',
-      businessArea: 'Payments',
-      lob: 'Core Banking',
-      comment: 'Primary PostgreSQL cluster node',
-      owner: 'Ada Lovelace',
-      contact: 'ada.lovelace@example.com',
-      os: 'RHEL 9',
-    },
-    {
-      name: 'edge-proxy-12',
-      businessArea: 'Platform',
-      lob: 'Networking',
-      comment: 'East coast edge proxy',
-      owner: 'Grace Hopper',
-      contact: 'grace.hopper@example.com',
-      os: 'Ubuntu 24.04',
-    },
-    {
-      name: 'batch-etl-07',
-      businessArea: 'Analytics',
-      lob: 'Data Platform',
-      comment: 'Nightly ETL runner',
-      owner: 'Alan Turing',
-      contact: 'alan.turing@example.com',
-      os: 'Windows Server 2022',
-    },
-  ];
-  for (const server of servers) {
-    await pb.collection('servers').create(server, { requestKey: null });
-  }
-
-  // --- On-call teams (oncall rows; teamId = lowercased team name) ---
-  // Team 1: fully assigned (primary + secondary, contacts + time windows).
-  const fullTeam = [
-    {
-      team: 'Database Reliability',
-      teamId: 'database reliability',
-      role: 'Primary',
-      name: 'Ada Lovelace',
-      contact: '5550100001',
-      timeWindow: '',
-      sortOrder: 0,
-    },
-    {
-      team: 'Database Reliability',
-      teamId: 'database reliability',
-      role: 'Secondary',
-      name: 'Grace Hopper',
-      contact: '5550100002',
-      timeWindow: '',
-      sortOrder: 1,
-    },
-  ];
-  // Team 2: standby-ish — primary assigned, standby row missing contact.
-  const standbyTeam = [
-    {
-      team: 'Network Ops',
-      teamId: 'network ops',
-      role: 'Primary',
-      name: 'Hedy Lamarr',
-      contact: '5550100005',
-      timeWindow: '',
-      sortOrder: 0,
-    },
-    {
-      team: 'Network Ops',
-      teamId: 'network ops',
-      role: 'Standby',
-      name: 'Claude Shannon',
-      contact: '',
-      timeWindow: '',
-      sortOrder: 1,
-    },
-  ];
-  // Team 3: EMPTY — placeholder row with no personnel (no-coverage state).
-  const emptyTeam = [
-    {
-      team: 'Payments Escalation',
-      teamId: 'payments escalation',
-      role: 'Primary',
-      name: '',
-      contact: '',
-      timeWindow: '',
-      sortOrder: 0,
-    },
-  ];
-  for (const row of [...fullTeam, ...standbyTeam, ...emptyTeam]) {
-    await pb.collection('oncall').create(row, { requestKey: null });
-  }
-
-  // --- Standalone notes with different category colors ---
-  const notes = [
-    {
-      title: 'Failover Runbook',
-      content: 'Promote replica, rotate credentials, update DNS. Validate with smoke suite.',
-      color: 'amber',
-      tags: ['runbook', 'database'],
-      sortOrder: 0,
-    },
-    {
-      title: 'Maintenance Window',
-      content: 'Edge proxies patched every second Tuesday, 02:00-04:00 UTC.',
-      color: 'blue',
-      tags: ['maintenance'],
-      sortOrder: 1,
-    },
-    {
-      title: 'Escalation Contacts',
-      content: 'Payments escalation currently unstaffed — see On-Call board.',
-      color: 'red',
-      tags: ['escalation', 'urgent'],
-      sortOrder: 2,
-    },
-  ];
-  for (const note of notes) {
-    await pb.collection('standalone_notes').create(note, { requestKey: null });
-  }
-
-  // --- One alert history entry ---
-  await pb.collection('alert_history').create(
-    {
-      severity: 'ISSUE',
-      subject: 'Degraded latency on prod-db-01',
-      bodyHtml: '<p>Elevated p99 latency observed on the primary database cluster.</p>',
-      sender: 'relay@relay.app',
-      recipient: 'oncall@example.com',
-      pinned: false,
-      label: 'Database',
-    },
-    { requestKey: null },
-  );
-};
+// Seed records keyed by PocketBase collection. On-call covers a fully staffed
+// team, a standby row missing its contact, and an empty (no-coverage) team.
+const SEED_RECORDS = JSON.parse(
+  fs.readFileSync(path.join(__dirname, 'fixtures/redesign-seed.json'), 'utf8'),
+) as SeedRecords;
 
 test.describe('Redesign screenshot harness', () => {
   test('captures Accent Ink screenshots across tabs and accent schemes', async () => {
@@ -264,53 +74,48 @@ test.describe('Redesign screenshot harness', () => {
 
     fs.mkdirSync(SHOTS_DIR, { recursive: true });
 
-    const mainEntry = path.join(__dirname, '../../dist/main/index.js');
-    const launchEnv = { ...process.env, NODE_ENV: 'test' };
-    delete (launchEnv as Record<string, string | undefined>).ELECTRON_RUN_AS_NODE;
-    const tempDataDir = fs.mkdtempSync(path.join(os.tmpdir(), 'relay-e2e-shots-'));
     const pbPort = makePort();
-    writeServerConfig(tempDataDir, pbPort);
-
-    const electronApp = await electron.launch({
-      args: [`--user-data-dir=${tempDataDir}`, mainEntry],
-      env: launchEnv,
+    const relay = await launchRelay({
+      tempPrefix: 'relay-e2e-shots-',
+      prepare: (userDataDir) => writeServerConfig(userDataDir, pbPort),
+      size: { width: 1920, height: 1080 },
     });
+    const electronApp = relay.app;
 
     try {
-      const window = await electronApp.firstWindow();
-      await electronApp.evaluate(({ BrowserWindow }) => {
-        const mainWindow = BrowserWindow.getAllWindows()[0];
-        mainWindow?.setSize(1920, 1080);
-      });
-      await window.waitForLoadState('domcontentloaded');
-      await expect(window.getByTestId('sidebar-compose')).toBeVisible({ timeout: 30_000 });
-
-      // Seed data through PocketBase, then reload so every tab starts hydrated.
-      await seedData(pbPort);
-      await window.reload();
-      await window.waitForLoadState('domcontentloaded');
+      const window = relay.window;
+
+      // Server mode starts PocketBase (app user and collections included) before
+      // the window exists, so seeding overlaps the first render. The reload that
+      // hydrates every tab must wait for that render: navigating during main's
+      // initial loadFile() aborts it and fails startup.
+      await Promise.all([
+        seedCollections(pbPort, SEED_RECORDS),
+        expect(window.getByTestId('sidebar-compose')).toBeVisible({ timeout: 30_000 }),
+      ]);
+      // Return on commit; the sidebar assertion below is the real readiness signal.
+      await window.reload({ waitUntil: 'commit' });
       await expect(window.getByTestId('sidebar-compose')).toBeVisible({ timeout: 30_000 });
 
-      // Verify no sidebar nav label is ellipsized at 1920×1080.
-      const truncated = await window.evaluate(() => {
-        return [...globalThis.document.querySelectorAll('.sidebar-button-label')]
-          .filter((el) => el.scrollWidth > el.clientWidth)
-          .map((el) => el.textContent);
+      // Sidebar layout at 1920×1080, gathered in one evaluate: no nav label is
+      // ellipsized, and no button is clipped by its flex container (≥ 100px wide).
+      // Only offenders come back, so the assertion messages name them.
+      const sidebar = await window.evaluate(() => {
+        const doc = globalThis.document;
+        return {
+          truncated: [...doc.querySelectorAll('.sidebar-button-label')]
+            .filter((el) => el.scrollWidth > el.clientWidth)
+            .map((el) => el.textContent),
+          clippedButtons: [...doc.querySelectorAll('.sidebar-button')]
+            .map((el) => ({
+              width: el.getBoundingClientRect().width,
+              label: el.querySelector('.sidebar-button-label')?.textContent,
+            }))
+            .filter((btn) => btn.width < 100),
+        };
       });
-      expect(truncated).toEqual([]);
-
-      // Verify sidebar buttons are not clipped by parent flex container (≥ 100px wide).
-      const buttonWidths = await window.evaluate(() => {
-        return [...globalThis.document.querySelectorAll('.sidebar-button')].map((el) => {
-          const rect = el.getBoundingClientRect();
-          const label = el.querySelector('.sidebar-button-label');
-          return { width: rect.width, label: label?.textContent };
-        });
-      });
-      for (const btn of buttonWidths) {
-        expect(btn.width).toBeGreaterThanOrEqual(100);
-      }
-      console.log('Sidebar button widths:', buttonWidths);
+      expect(sidebar.truncated).toEqual([]);
+      expect(sidebar.clippedButtons).toEqual([]);
 
       // Default accent (red) for the tab tour.
       await setAccentViaStorage(window, 'red');
@@ -322,13 +127,13 @@ test.describe('Redesign screenshot harness', () => {
 
       // --- On-Call ---
       await goToTab(window, 'sidebar-on-call', 'On-Call');
-      await expect(window.getByRole('button', { name: 'ADD CARD' })).toBeVisible();
-      await expect(
-        window.locator('.team-card-body', { hasText: 'Database Reliability' }),
-      ).toBeVisible();
-      await expect(
-        window.locator('.team-card-body', { hasText: 'Payments Escalation' }),
-      ).toBeVisible();
+      // Independent checks: poll them together rather than one after another.
+      const teamCard = (name: string) => window.locator('.team-card-body', { hasText: name });
+      await Promise.all([
+        expect(window.getByRole('button', { name: 'ADD CARD' })).toBeVisible(),
+        expect(teamCard('Database Reliability')).toBeVisible(),
+        expect(teamCard('Payments Escalation')).toBeVisible(),
+      ]);
       // Layout contract: member names never wrap to a second line (ellipsize instead).
       const wrappedNameCount = await window.evaluate(() => {
         const names = Array.from(globalThis.document.querySelectorAll('.team-row-name'));
@@ -343,8 +148,7 @@ test.describe('Redesign screenshot harness', () => {
       // --- Toast (trigger via Copy All; raw capture — shoot() would dismiss it) ---
       await window.getByRole('button', { name: 'COPY ALL' }).click();
       await expect(window.locator('.toast')).toBeVisible();
-      await window.waitForTimeout(400);
-      await window.screenshot({ path: path.join(SHOTS_DIR, 'toast.png'), fullPage: false });
+      await capture(window, 'toast.png');
 
       // --- People ---
       await goToTab(window, 'sidebar-people', 'People');
@@ -360,6 +164,10 @@ test.describe('Redesign screenshot harness', () => {
 
       // --- Alerts ---
       await goToTab(window, 'sidebar-alerts', 'Alerts');
+      // The breadcrumb updates before the lazy tab renders; wait for its content.
+      const alertsPanel = window.locator('.tab-panel--active');
+      await expect(alertsPanel.locator('.alerts-layout')).toBeVisible();
+      await expect(alertsPanel.getByRole('button', { name: 'HISTORY' })).toBeVisible();
       await shoot(window, 'alerts.png');
 
       // --- Alert history modal (seeded with one ISSUE entry) ---
@@ -377,6 +185,11 @@ test.describe('Redesign screenshot harness', () => {
 
       // --- Cloud / Service Status ---
       await goToTab(window, 'sidebar-status', 'Service Status');
+      // The tab shows its fallback until status data arrives, and the refresh
+      // button stays disabled while a fetch is in flight.
+      const statusPanel = window.locator('.tab-panel--active');
+      await expect(statusPanel.locator('.cloud-status__title')).toContainText('Command Center');
+      await expect(statusPanel.getByRole('button', { name: 'Refresh cloud status' })).toBeEnabled();
       await shoot(window, 'cloud-status.png');
 
       // --- Settings modal with accent picker ---
@@ -410,16 +223,10 @@ test.describe('Redesign screenshot harness', () => {
 
       // --- Accent matrix on the On-Call board (empty-team alarm visible) ---
       await goToTab(window, 'sidebar-on-call', 'On-Call');
-      await expect(
-        window.locator('.team-card-body', { hasText: 'Payments Escalation' }),
-      ).toBeVisible();
+      await expect(teamCard('Payments Escalation')).toBeVisible();
       for (const accent of ['red', 'blue', 'green', 'pink', 'purple'] as const) {
         await setAccentViaStorage(window, accent);
-        await expect
-          .poll(() =>
-            window.evaluate(() => globalThis.document.documentElement.getAttribute('data-accent')),
-          )
-          .toBe(accent);
+        await expect(window.locator('html')).toHaveAttribute('data-accent', accent);
         await shoot(window, `oncall-${accent}.png`);
       }
 
@@ -430,11 +237,9 @@ test.describe('Redesign screenshot harness', () => {
         await window.getByRole('button', { name: 'Pop Out Board' }).click();
         const popout = await popoutPromise;
         await popout.waitForLoadState('domcontentloaded');
-        await electronApp.evaluate(({ BrowserWindow }) => {
-          const wins = BrowserWindow.getAllWindows();
-          // Resize the most recently created window (the popout).
-          wins[wins.length - 1]?.setSize(1920, 1080);
-        });
+        // The popout opens at its default size; wait for the viewport to reach
+        // 1920x1080 so the capture never shows the old or a half-resized layout.
+        await resizeWindow(electronApp, popout, { width: 1920, height: 1080 });
         await expect(popout.locator('.popout-title')).toBeVisible({ timeout: 20_000 });
         await expect(popout.locator('body')).toContainText('Database Reliability');
         await shoot(popout, 'popout.png');
@@ -446,12 +251,7 @@ test.describe('Redesign screenshot harness', () => {
       // Reset accent to the default red before shutting down.
       await setAccentViaStorage(window, 'red');
     } finally {
-      try {
-        await electronApp.close();
-      } catch {
-        // Already closed.
-      }
-      fs.rmSync(tempDataDir, { recursive: true, force: true });
+      await relay.close();
     }
   });
 });